@@ -5,34 +5,161 @@ This is a lightweight Tkinter dashboard demonstrating FaceDisplay embedding.
 \"\"\"
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
-import sqlite3, os, datetime, json, requests
+import sqlite3, time, json, atexit, threading
+from pathlib import Path
+from queue import Queue, Empty, Full
+from concurrent.futures import ThreadPoolExecutor
 
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DB_PATH = os.path.join(BASE_DIR, "..", "events", "events.db")
-CONFIG_PATH = os.path.join(BASE_DIR, "..", "config.json")
+# Resolved once at import so no ".." components reach sqlite3/open
+BASE_DIR = Path(__file__).resolve().parent
+EVENTS_DIR = BASE_DIR.parent / "events"
+DB_PATH = EVENTS_DIR / "events.db"
+CONFIG_PATH = BASE_DIR.parent / "config.json"
 
 # Create events DB directory if missing
-os.makedirs(os.path.join(BASE_DIR, "..", "events"), exist_ok=True)
+EVENTS_DIR.mkdir(parents=True, exist_ok=True)
+
+class SQLiteConnectionPool:
+    """Small queue-backed pool so handlers reuse open connections instead of reconnecting."""
+    def __init__(self, db_path, max_connections=4):
+        self.db_path = db_path
+        self.max_connections = max_connections
+        self._pool = Queue(maxsize=max_connections)
+        # Tk handlers and background threads share the pool; serialize writes
+        self.write_lock = threading.Lock()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        # per-connection settings; journal_mode=WAL is persisted by init_db
+        cur = conn.cursor()
+        cur.execute("PRAGMA synchronous=NORMAL")
+        cur.execute("PRAGMA busy_timeout=5000")
+        cur.execute("PRAGMA cache_size=-32000")
+        return conn
+
+    def get_connection(self):
+        try:
+            return self._pool.get_nowait()
+        except Empty:
+            return self._connect()
+
+    def put_connection(self, conn):
+        try:
+            self._pool.put_nowait(conn)
+        except Full:
+            conn.close()
+
+    def close_all(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except Empty:
+                break
+
+_DB_POOL = SQLiteConnectionPool(str(DB_PATH), max_connections=4)
+atexit.register(_DB_POOL.close_all)
+
+# Schema setup only needs to run once per process
+_DB_INITED = False
+# id is the rowid: ORDER BY id DESC walks the table b-tree backwards with no
+# sort or extra index, and skipping AUTOINCREMENT avoids a sqlite_sequence
+# update on every insert
+_CREATE_WAKE_EVENTS = "CREATE TABLE IF NOT EXISTS wake_events (id INTEGER PRIMARY KEY, timestamp INTEGER, phrase TEXT, matched INTEGER);\n"
+
+# v1: timestamp holds epoch seconds as INTEGER instead of formatted TEXT, and
+# id drops AUTOINCREMENT. Old rows are converted from local time text; rows
+# that already hold epoch seconds (as numbers or digit strings) are kept as is.
+_MIGRATE_V0_TO_V1 = """
+CREATE TABLE wake_events_v1 (id INTEGER PRIMARY KEY, timestamp INTEGER, phrase TEXT, matched INTEGER);
+INSERT INTO wake_events_v1 (id, timestamp, phrase, matched)
+    SELECT id,
+        CASE WHEN typeof(timestamp) IN ('integer', 'real') OR (timestamp <> '' AND timestamp NOT GLOB '*[^0-9]*')
+            THEN CAST(timestamp AS INTEGER)
+            ELSE CAST(strftime('%s', timestamp, 'utc') AS INTEGER) END,
+        phrase, matched FROM wake_events;
+DROP TABLE wake_events;
+ALTER TABLE wake_events_v1 RENAME TO wake_events;
+"""
+
+# Step i upgrades an existing wake_events from user_version i to i+1
+_MIGRATIONS = [_MIGRATE_V0_TO_V1]
+_DB_SCHEMA_VERSION = len(_MIGRATIONS)
 
 def init_db():
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    cur.execute("CREATE TABLE IF NOT EXISTS wake_events (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT, phrase TEXT, matched INTEGER)")
-    conn.commit()
-    conn.close()
+    global _DB_INITED
+    if _DB_INITED:
+        return
+    conn = _DB_POOL.get_connection()
+    try:
+        with _DB_POOL.write_lock:
+            cur = conn.cursor()
+            cur.execute("PRAGMA journal_mode=WAL")
+            version = cur.execute("PRAGMA user_version").fetchone()[0]
+            if version < _DB_SCHEMA_VERSION:
+                exists = cur.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='wake_events'").fetchone()
+                steps = _MIGRATIONS[version:] if exists else []
+                script = "BEGIN;\n" + "".join(steps) + _CREATE_WAKE_EVENTS + f"PRAGMA user_version = {_DB_SCHEMA_VERSION};\nCOMMIT;\n"
+                try:
+                    conn.executescript(script)
+                except Exception:
+                    # never hand a half-migrated transaction back to the pool
+                    conn.rollback()
+                    conn.close()
+                    conn = None
+                    raise
+        _DB_INITED = True
+    finally:
+        if conn is not None:
+            _DB_POOL.put_connection(conn)
+
+# Parsed config.json, reused until the file's mtime changes
+_CONFIG_CACHE = None
+_CONFIG_MTIME = None
 
 def load_config():
-    if not os.path.exists(CONFIG_PATH):
+    global _CONFIG_CACHE, _CONFIG_MTIME
+    if not CONFIG_PATH.exists():
         default = {"telegram_token":"", "telegram_chat_id":""}
-        with open(CONFIG_PATH,"w") as f: json.dump(default,f,indent=2)
-        return default
+        save_config(default)
+        return default.copy()
     try:
-        return json.load(open(CONFIG_PATH))
+        mtime = CONFIG_PATH.stat().st_mtime
+        if _CONFIG_CACHE is None or mtime != _CONFIG_MTIME:
+            with open(CONFIG_PATH) as f: _CONFIG_CACHE = json.load(f)
+            _CONFIG_MTIME = mtime
+        return _CONFIG_CACHE.copy()
     except Exception:
         return {"telegram_token":"", "telegram_chat_id":""}
 
 def save_config(cfg):
+    global _CONFIG_CACHE, _CONFIG_MTIME
     with open(CONFIG_PATH,"w") as f: json.dump(cfg,f,indent=2)
+    _CONFIG_CACHE = dict(cfg)
+    _CONFIG_MTIME = CONFIG_PATH.stat().st_mtime
+
+# Shared session so alerts reuse the pooled HTTPS connection to Telegram.
+# requests is imported on first use so importing this module stays cheap.
+_TG_SESSION = None
+_TG_SESSION_LOCK = threading.Lock()
+# Alerts are posted from worker threads so the Tk mainloop never waits on the network
+_TG_POOL = ThreadPoolExecutor(max_workers=2)
+atexit.register(_TG_POOL.shutdown)
+
+def _get_session():
+    global _TG_SESSION
+    with _TG_SESSION_LOCK:
+        if _TG_SESSION is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            _TG_SESSION = requests.Session()
+            _TG_SESSION.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        return _TG_SESSION
+
+def _do_post(url, payload):
+    try:
+        _get_session().post(url, data=payload, timeout=5)
+    except Exception as e:
+        print("Telegram error:", e)
 
 def send_telegram_alert(message):
     cfg = load_config()
@@ -42,41 +169,121 @@ def send_telegram_alert(message):
         print("Telegram not configured")
         return
     url = f"https://api.telegram.org/bot{token}/sendMessage"
+    _TG_POOL.submit(_do_post, url, {"chat_id": chat_id, "text": message})
+
+# Wake events are buffered and written in one transaction per flush
+_EVENT_BUF: list[tuple] = []
+_EVENT_LOCK = threading.Lock()
+_EVENT_FLUSH_AT = 20
+# Longest a buffered event may wait before it is written, with or without Tk
+_EVENT_MAX_AGE = 2.0
+# Timer flushes retried per arming, and the most events kept while the DB is failing
+_EVENT_FLUSH_RETRIES = 5
+_EVENT_BUF_MAX = 1000
+_FLUSH_TIMER = None
+
+def _trim_event_buf():
+    # caller holds _EVENT_LOCK; drop the oldest events past the cap
+    excess = len(_EVENT_BUF) - _EVENT_BUF_MAX
+    if excess > 0:
+        del _EVENT_BUF[:excess]
+        print(f'Wake log buffer full, dropped {excess} oldest event(s)')
+
+def flush_wake_events():
+    with _EVENT_LOCK:
+        if not _EVENT_BUF:
+            return
+    # make sure the table is migrated before epoch ints are written into it
+    init_db()
+    conn = _DB_POOL.get_connection()
+    try:
+        with _DB_POOL.write_lock:
+            # only take the rows once a connection is in hand
+            with _EVENT_LOCK:
+                rows = _EVENT_BUF[:]
+                del _EVENT_BUF[:]
+            if not rows:
+                return
+            try:
+                conn.executemany("INSERT INTO wake_events (timestamp, phrase, matched) VALUES (?,?,?)", rows)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                # keep the events for the next flush, ahead of anything logged since
+                with _EVENT_LOCK:
+                    _EVENT_BUF[:0] = rows
+                    _trim_event_buf()
+                raise
+    finally:
+        _DB_POOL.put_connection(conn)
+
+atexit.register(flush_wake_events)
+
+def _schedule_flush(attempt=0):
+    # caller holds _EVENT_LOCK
+    global _FLUSH_TIMER
+    _FLUSH_TIMER = threading.Timer(_EVENT_MAX_AGE, _flush_wake_events_timer, (attempt,))
+    _FLUSH_TIMER.daemon = True
+    _FLUSH_TIMER.start()
+
+def _flush_wake_events_timer(attempt):
+    global _FLUSH_TIMER
+    error = None
     try:
-        requests.post(url, data={"chat_id": chat_id, "text": message})
+        flush_wake_events()
     except Exception as e:
-        print("Telegram error:", e)
+        error = e
+    with _EVENT_LOCK:
+        _FLUSH_TIMER = None
+        if error is None:
+            retry = 0
+        elif attempt + 1 < _EVENT_FLUSH_RETRIES:
+            retry = attempt + 1
+        else:
+            # give up until the next logged event arms a fresh timer
+            retry = None
+        # events logged while this flush ran have no timer of their own
+        if _EVENT_BUF and retry is not None:
+            _schedule_flush(retry)
+    if error is not None:
+        print('Wake log flush failed:', error)
 
 def log_wake_event(phrase, matched):
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    ts = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    cur.execute("INSERT INTO wake_events (timestamp, phrase, matched) VALUES (?,?,?)", (ts, phrase, int(matched)))
-    conn.commit()
-    conn.close()
+    now = time.time()
+    with _EVENT_LOCK:
+        _EVENT_BUF.append((int(now), phrase, int(matched)))
+        _trim_event_buf()
+        full = len(_EVENT_BUF) >= _EVENT_FLUSH_AT
+        # bound how long this event can sit in memory in processes without a Dashboard
+        if _FLUSH_TIMER is None:
+            _schedule_flush()
+    # unmatched attempts raise an alert, so make sure they are on disk right away
+    if full or not matched:
+        # a failed write keeps the rows buffered; it must not block the alert below
+        try:
+            flush_wake_events()
+        except Exception as e:
+            print('Wake log flush failed:', e)
     if not matched:
+        ts = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
         send_telegram_alert(f\"🚨 Wake Attempt Detected\\nTime: {ts}\\nHeard: '{phrase}'\")
 
-# Try to import PanTilt and FaceDisplay
-try:
-    from robot.pan_tilt import PanTilt
-except Exception:
-    PanTilt = None
-
-try:
-    from robot.face_display import FaceDisplay
-except Exception:
-    FaceDisplay = None
-
 class Dashboard(tk.Tk):
     def __init__(self):
         super().__init__()
         self.title(\"Jarvis Dashboard\")
         self.geometry(\"1024x600\")
         init_db()
-        self.create_widgets()
+        self._last_event_id = 0
+        # face display is imported and built when its tab is first shown
+        self.face = None
+        self._face_loaded = False
         # attempt to create PanTilt hardware, fallback to simulator
         self.pan_tilt = None
+        try:
+            from robot.pan_tilt import PanTilt
+        except Exception:
+            PanTilt = None
         if PanTilt is not None:
             try:
                 # default pins (customize if your wiring differs)
@@ -84,14 +291,10 @@ class Dashboard(tk.Tk):
             except Exception as e:
                 print('PanTilt init failed:', e)
                 self.pan_tilt = None
-        # start face display
-        if FaceDisplay is not None:
-            self.face_frame = tk.Frame(self.tab_face)
-            self.face_frame.pack(fill='both', expand=True)
-            self.face = FaceDisplay(self.face_frame, width=640, height=320, pan_tilt=self.pan_tilt)
-            self.face.start(interval_ms=60)
-        else:
-            tk.Label(self.tab_face, text='FaceDisplay not available', fg='red').pack()
+        self.create_widgets()
+        self.protocol('WM_DELETE_WINDOW', self.on_close)
+        # start face display if its tab is showing
+        self._on_tab()
 
     def create_widgets(self):
         tabControl = ttk.Notebook(self)
@@ -104,6 +307,9 @@ class Dashboard(tk.Tk):
         tabControl.add(self.tab_logs, text='Logs')
         tabControl.add(self.tab_settings, text='Settings')
         tabControl.pack(expand=1, fill='both')
+        self.tab_control = tabControl
+        # only animate the face while its tab is visible
+        tabControl.bind('<<NotebookTabChanged>>', self._on_tab)
 
         # Games Tab
         tk.Button(self.tab_games, text=\"Play Rock-Paper-Scissors\", command=self.play_rps).pack(pady=10)
@@ -122,6 +328,28 @@ class Dashboard(tk.Tk):
         tk.Button(self.tab_settings, text='Configure Telegram', command=self.configure_telegram).pack(pady=6)
         tk.Button(self.tab_settings, text='Center Camera (Pan/Tilt)', command=self.center_camera).pack(pady=6)
 
+    def _load_face(self):
+        self._face_loaded = True
+        try:
+            from robot.face_display import FaceDisplay
+        except Exception:
+            FaceDisplay = None
+        if FaceDisplay is not None:
+            self.face_frame = tk.Frame(self.tab_face)
+            self.face_frame.pack(fill='both', expand=True)
+            self.face = FaceDisplay(self.face_frame, width=640, height=320, pan_tilt=self.pan_tilt)
+        else:
+            tk.Label(self.tab_face, text='FaceDisplay not available', fg='red').pack()
+
+    def _on_tab(self, event=None):
+        if self.tab_control.select() == str(self.tab_face):
+            if not self._face_loaded:
+                self._load_face()
+            if self.face is not None:
+                self.face.start(interval_ms=60)
+        elif self.face is not None:
+            self.face.stop()
+
     def play_rps(self):
         try:
             from robot.rps_voice_improved import RPSGame
@@ -133,27 +361,52 @@ class Dashboard(tk.Tk):
         except Exception as e:
             messagebox.showerror('Error', str(e))
 
+    def on_close(self):
+        try:
+            flush_wake_events()
+        except Exception as e:
+            print('Wake log flush failed:', e)
+        self.destroy()
+
     def load_wake_logs(self):
-        self.log_list.delete(0, tk.END)
+        # only fetch rows newer than the last one shown; newest stays on top
         try:
-            conn = sqlite3.connect(DB_PATH)
-            cur = conn.cursor()
-            cur.execute(\"SELECT timestamp, phrase, matched FROM wake_events ORDER BY id DESC LIMIT 100\")
-            rows = cur.fetchall()
-            conn.close()
-            for ts, phrase, matched in rows:
+            flush_wake_events()
+            conn = _DB_POOL.get_connection()
+            try:
+                cur = conn.cursor()
+                cur.execute(\"SELECT id, datetime(timestamp, 'unixepoch', 'localtime'), phrase, matched FROM wake_events WHERE id > ? ORDER BY id DESC LIMIT 100\", (self._last_event_id,))
+                rows = cur.fetchall()
+            finally:
+                _DB_POOL.put_connection(conn)
+            if not rows:
+                return
+            if self._last_event_id == 0:
+                self.log_list.delete(0, tk.END)
+            for _id, ts, phrase, matched in reversed(rows):
                 tag = 'MATCH' if matched else 'TRY'
-                self.log_list.insert(tk.END, f\"[{ts}] ({tag}) {phrase}\")
+                self.log_list.insert(0, f\"[{ts}] ({tag}) {phrase}\")
+            self._last_event_id = rows[0][0]
+            self.log_list.delete(100, tk.END)
         except Exception as e:
+            self.log_list.delete(0, tk.END)
             self.log_list.insert(tk.END, f\"DB Error: {e}\")
+            self._last_event_id = 0
 
     def clear_wake_logs(self):
         if not messagebox.askyesno('Confirm', 'Clear wake logs?'): return
         try:
-            conn = sqlite3.connect(DB_PATH)
-            cur = conn.cursor()
-            cur.execute('DELETE FROM wake_events')
-            conn.commit(); conn.close()
+            flush_wake_events()
+            conn = _DB_POOL.get_connection()
+            try:
+                with _DB_POOL.write_lock:
+                    cur = conn.cursor()
+                    cur.execute('DELETE FROM wake_events')
+                    conn.commit()
+            finally:
+                _DB_POOL.put_connection(conn)
+            self.log_list.delete(0, tk.END)
+            self._last_event_id = 0
             self.load_wake_logs()
         except Exception as e:
             messagebox.showerror('Error', str(e))
@@ -12,12 +12,33 @@ import math
 import time
 import random
 
+# Idle micro-movement sampled once over its full period. The component
+# frequencies (0.8, 1.3, 1.1 rad/s) all repeat after 20*pi seconds, so the
+# table wraps seamlessly.
+_JITTER_SIZE = 1024
+_JITTER_PERIOD = 20 * math.pi
+_JITTER_SCALE = _JITTER_SIZE / _JITTER_PERIOD
+_JITTER_TABLE = []
+for _i in range(_JITTER_SIZE):
+    _t = _i / _JITTER_SCALE
+    _JITTER_TABLE.append((math.sin(_t * 0.8) * 2.0 + math.sin(_t*1.3)*1.0, math.cos(_t * 1.1) * 1.2 * 0.6))
+del _i, _t
+
 class FaceDisplay:
+    # blink schedule: (delay_ms, lid progress) steps, then lids cleared at _BLINK_END_MS
+    _BLINK_STEPS = ((40, 0.5), (80, 1.0), (220, 0.5))
+    _BLINK_END_MS = 260
+    # lid positions are quantized to this many frames (0=open .. last=closed)
+    _LID_FRAMES = 8
+
     def __init__(self, parent, width: int = 640, height: int = 320, pan_tilt: Optional[object] = None):
         self.parent = parent
         self.width = width
         self.height = height
         self.pan_tilt = pan_tilt
+        # resolve pan/tilt capability once instead of probing it every tick
+        self._has_pt = pan_tilt is not None
+        self._pt_get_angles = getattr(pan_tilt, 'get_angles', None) if self._has_pt else None
         self.canvas = tk.Canvas(parent, width=width, height=height, bg='black', highlightthickness=0)
         # geometry
         self.eye_radius = min(width, height) * 0.18
@@ -36,6 +57,10 @@ class FaceDisplay:
         self.tilt_max = 150.0
         # pupil travel
         self.pupil_travel = self.eye_radius - self.pupil_radius - 6
+        # reciprocals/products used by angle_to_offset every tick
+        self._pan_scale = 1.0 / (self.pan_max - self.pan_min)
+        self._tilt_scale = 1.0 / (self.tilt_max - self.tilt_min)
+        self._travel_y = self.pupil_travel * 0.6
         # blink / idle parameters
         self.running = False
         self.blinking = False
@@ -47,8 +72,15 @@ class FaceDisplay:
         self.smooth_pan = 90.0
         self.smooth_tilt = 90.0
         self.smooth_factor = 0.18  # 0..1 smoothing (higher = faster)
+        # last applied pupil offset / lid progress, to skip redundant canvas updates
+        self._last_dx = None
+        self._last_dy = None
+        self._last_lid_idx = None
+        # pupil offset last drawn from pan/tilt angles
+        self._angle_offset = None
         # start loop interval
         self.interval_ms = 60
+        self._after_id = None
 
     def _create_graphics(self):
         lwx, lwy = self.left_center
@@ -62,90 +94,109 @@ class FaceDisplay:
         self.left_pupil = self.canvas.create_oval(lwx-pr, lwy-pr, lwx+pr, lwy+pr, fill='black')
         self.right_pupil = self.canvas.create_oval(rwx-pr, rwy-pr, rwx+pr, rwy+pr, fill='black')
         # eyelids are arcs we manipulate by drawing rectangles over eyes during blink
-        self.left_lid = self.canvas.create_rectangle(0,0,0,0, fill='black', outline='')
-        self.right_lid = self.canvas.create_rectangle(0,0,0,0, fill='black', outline='')
+        self.left_lid = self.canvas.create_rectangle(0,0,0,0, fill='black', outline='', state='hidden')
+        self.right_lid = self.canvas.create_rectangle(0,0,0,0, fill='black', outline='', state='hidden')
         self.canvas.pack()
+        # pupil bounding boxes at zero offset; per-tick updates only add dx/dy
+        self._l_xm, self._l_ym, self._l_xp, self._l_yp = lwx-pr, lwy-pr, lwx+pr, lwy+pr
+        self._r_xm, self._r_ym, self._r_xp, self._r_yp = rwx-pr, rwy-pr, rwx+pr, rwy+pr
+        # lid rectangles for each blink frame; top lid covers from top downwards
+        steps = self._LID_FRAMES - 1
+        self._lid_frames_l = [(lwx-er, lwy-er, lwx+er, lwy-er + int(er*2*i/steps)) for i in range(self._LID_FRAMES)]
+        self._lid_frames_r = [(rwx-er, rwy-er, rwx+er, rwy-er + int(er*2*i/steps)) for i in range(self._LID_FRAMES)]
 
     def angle_to_offset(self, pan: float, tilt: float) -> Tuple[float, float]:
-        pn = (pan - self.pan_min) / (self.pan_max - self.pan_min)
-        tn = (tilt - self.tilt_min) / (self.tilt_max - self.tilt_min)
+        pn = (pan - self.pan_min) * self._pan_scale
+        tn = (tilt - self.tilt_min) * self._tilt_scale
         px = (pn - 0.5) * 2.0
-        py = (tn - 0.5) * 2.0
-        py = -py
-        px = max(-1.0, min(1.0, px))
-        py = max(-1.0, min(1.0, py))
-        return px * self.pupil_travel, py * (self.pupil_travel * 0.6)
+        py = (0.5 - tn) * 2.0
+        if px > 1.0: px = 1.0
+        elif px < -1.0: px = -1.0
+        if py > 1.0: py = 1.0
+        elif py < -1.0: py = -1.0
+        return px * self.pupil_travel, py * self._travel_y
 
     def _apply_offsets(self, dx, dy):
-        lx, ly = self.left_center
-        rx, ry = self.right_center
-        pr = self.pupil_radius
-        self.canvas.coords(self.left_pupil, lx+dx-pr, ly+dy-pr, lx+dx+pr, ly+dy+pr)
-        self.canvas.coords(self.right_pupil, rx+dx-pr, ry+dy-pr, rx+dx+pr, ry+dy+pr)
+        # subpixel changes are invisible; leave the canvas untouched
+        if self._last_dx is not None and abs(dx - self._last_dx) < 0.5 and abs(dy - self._last_dy) < 0.5:
+            return
+        self._last_dx = dx
+        self._last_dy = dy
+        coords = self.canvas.coords
+        coords(self.left_pupil, self._l_xm+dx, self._l_ym+dy, self._l_xp+dx, self._l_yp+dy)
+        coords(self.right_pupil, self._r_xm+dx, self._r_ym+dy, self._r_xp+dx, self._r_yp+dy)
 
     def _draw_blink(self, progress: float):
         # progress 0..1 where 0=open, 1=closed
-        # compute lid rectangle height
-        for center, lid in ((self.left_center, self.left_lid), (self.right_center, self.right_lid)):
-            cx, cy = center
-            er = self.eye_radius
-            # top lid covers from top downwards
-            lid_h = int(er * 2 * progress)
-            x0 = cx - er
-            y0 = cy - er
-            x1 = cx + er
-            y1 = cy - er + lid_h
-            self.canvas.coords(lid, x0, y0, x1, y1)
+        idx = int(progress * (self._LID_FRAMES - 1) + 0.5)
+        if idx == self._last_lid_idx:
+            return
+        if self._last_lid_idx is None:
+            self.canvas.itemconfig(self.left_lid, state='normal')
+            self.canvas.itemconfig(self.right_lid, state='normal')
+        self._last_lid_idx = idx
+        self.canvas.coords(self.left_lid, *self._lid_frames_l[idx])
+        self.canvas.coords(self.right_lid, *self._lid_frames_r[idx])
 
     def _clear_blink(self):
-        # hide lids by moving them off-canvas
-        w = self.width
-        self.canvas.coords(self.left_lid, 0,0,0,0)
-        self.canvas.coords(self.right_lid, 0,0,0,0)
+        # hide lids until the next blink
+        self._last_lid_idx = None
+        self.canvas.itemconfig(self.left_lid, state='hidden')
+        self.canvas.itemconfig(self.right_lid, state='hidden')
+
+    def _start_blink(self):
+        # 3-phase blink: close, hold, open
+        self.blinking = True
+        for delay, prog in self._BLINK_STEPS:
+            self.parent.after(delay, self._draw_blink, prog)
+        self.parent.after(self._BLINK_END_MS, self._end_blink)
+
+    def _end_blink(self):
+        self.blinking = False
+        self._clear_blink()
+        self.last_blink = time.time()
+        self.next_blink_in = random.uniform(3.0, 12.0)
 
     def _idle_offsets(self, t):
         # small natural micro-movements when no pan/tilt change
-        jitter_x = math.sin(t * 0.8) * 2.0 + math.sin(t*1.3)*1.0
-        jitter_y = math.cos(t * 1.1) * 1.2
-        return jitter_x, jitter_y * 0.6
+        return _JITTER_TABLE[int(t * _JITTER_SCALE) & (_JITTER_SIZE - 1)]
 
     def update_from_angles(self, pan: float, tilt: float):
         # smooth toward desired angles to avoid jitter
         self.smooth_pan += (pan - self.smooth_pan) * self.smooth_factor
         self.smooth_tilt += (tilt - self.smooth_tilt) * self.smooth_factor
+        # once converged, the offset for this pose is already on screen
+        if (abs(pan - self.smooth_pan) < 0.05 and abs(tilt - self.smooth_tilt) < 0.05
+                and self._angle_offset == (self._last_dx, self._last_dy)):
+            return
         dx, dy = self.angle_to_offset(self.smooth_pan, self.smooth_tilt)
         self._apply_offsets(dx, dy)
+        self._angle_offset = (self._last_dx, self._last_dy)
 
     def _loop(self):
         if not self.running:
             return
         now = time.time()
-        # check blinking
-        if now - self.last_blink > self.next_blink_in and not self.blinking:
-            # start blink
-            self.blinking = True
-            self.blink_start = now
-        if self.blinking:
-            # 3-phase blink: close (0.0->1.0), hold, open (1.0->0.0)
-            elapsed = now - self.blink_start
-            if elapsed < 0.08:
-                prog = min(1.0, elapsed / 0.08)
-                self._draw_blink(prog)
-            elif elapsed < 0.18:
-                self._draw_blink(1.0)
-            elif elapsed < 0.26:
-                prog = max(0.0, 1.0 - (elapsed - 0.18)/0.08)
-                self._draw_blink(prog)
-            else:
-                self.blinking = False
-                self._clear_blink()
-                self.last_blink = now
-                self.next_blink_in = random.uniform(3.0, 12.0)
+        # check blinking; the blink itself runs on its own after() callbacks
+        if not self.blinking and now - self.last_blink > self.next_blink_in:
+            self._start_blink()
         # read pan_tilt angles if available
         pan = None; tilt = None
-        if self.pan_tilt is not None:
-            pan = getattr(self.pan_tilt, 'angle_pan', None)
-            tilt = getattr(self.pan_tilt, 'angle_tilt', None)
+        if self._has_pt:
+            try:
+                if self._pt_get_angles is not None:
+                    angles = self._pt_get_angles()
+                    if angles is not None:
+                        pan, tilt = angles
+                else:
+                    pan = self.pan_tilt.angle_pan
+                    tilt = self.pan_tilt.angle_tilt
+            except AttributeError:
+                # object does not report angles; stay in idle mode from now on
+                self._has_pt = False
+            except Exception:
+                # bad reading or hardware hiccup; idle this tick and keep the loop alive
+                pan = None; tilt = None
         if pan is not None and tilt is not None:
             self.update_from_angles(pan, tilt)
         else:
@@ -156,14 +207,18 @@ class FaceDisplay:
             dy = jitter_y
             self._apply_offsets(dx, dy)
         # schedule next tick
-        self.parent.after(self.interval_ms, self._loop)
+        self._after_id = self.parent.after(self.interval_ms, self._loop)
 
     def start(self, interval_ms: int = 60):
         if self.running:
             return
         self.interval_ms = interval_ms
         self.running = True
-        self.parent.after(0, self._loop)
+        self._after_id = self.parent.after_idle(self._loop)
 
     def stop(self):
         self.running = False
+        # cancel the pending tick so a quick stop()/start() cannot leave two loops running
+        if self._after_id is not None:
+            self.parent.after_cancel(self._after_id)
+            self._after_id = None